@@ -1,15 +1,14 @@
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 
 from api.schemas import (ResumeCreate, ResumeOut, ResumeUpdate, Token,
                          UserLogin, UserRegistration)
-from database.crud import ResumeDAO, UserDAO
+from database.crud import read_dao, resume_dao, user_dao
 from services.auth_service import (create_access_token, get_current_user,
-                                   hash_password, verify_password)
-
-userdb = UserDAO()
-resumedb = ResumeDAO()
+                                   hash_password_async, password_needs_rehash,
+                                   verify_password_async)
 
 
 router = APIRouter(tags=["API"], prefix="/api")
@@ -18,52 +17,51 @@ router = APIRouter(tags=["API"], prefix="/api")
 """
 
 
-@router.post("/user/registration", response_model=Token)
-async def register(body: UserRegistration) -> Token:
+@router.post("/user/registration", response_model=None, responses={200: {"model": Token}})
+async def register(body: UserRegistration) -> ORJSONResponse:
     """
     Зарегистрировать нового пользователя.
 
-    - Проверяет уникальность e-mail.
-    - Хэширует пароль и создаёт пользователя.
+    - Хэширует пароль.
+    - Создаёт пользователя одним запросом, если e-mail ещё не занят.
     - Возвращает JWT-токен доступа.
 
     :param body: Данные регистрации пользователя (e-mail и пароль).
     :raises HTTPException: 400 — если пользователь с таким e-mail уже существует.
-    :return: Объект `Token` с access token.
+    :return: JSON-ответ в формате схемы `Token` (без валидации через Pydantic).
     """
-    if await userdb.get_user_by_email(str(body.email)):
+    hashed = await hash_password_async(body.password)
+    if await user_dao.create_if_absent(email=str(body.email), hashed_password=hashed) is None:
         raise HTTPException(status_code=400, detail="Пользователь с таким email уже существует")
-    hashed = hash_password(body.password)
-    await userdb.create_user(email=str(body.email), hashed_password=hashed)
-    return create_access_token(sub=str(body.email))
+    return ORJSONResponse(create_access_token(sub=str(body.email)))
 
 
-@router.post("/user/login", response_model=Token)
-async def login(body: UserLogin) -> Token:
+@router.post("/user/login", response_model=None, responses={200: {"model": Token}})
+async def login(body: UserLogin) -> ORJSONResponse:
     """
     Выполнить вход пользователя.
 
     - Ищет пользователя по e-mail.
     - Проверяет пароль.
+    - Перехэширует пароль, если хэш устарел (например, bcrypt).
     - Возвращает JWT-токен доступа.
 
     :param body: Данные для входа (e-mail и пароль).
     :raises HTTPException: 401 — если пара e-mail/пароль неверна.
-    :return: Объект `Token` с access token.
+    :return: JSON-ответ в формате схемы `Token` (без валидации через Pydantic).
     """
-    user = await userdb.get_user_by_email(str(body.email))
-    if not user or not verify_password(body.password, user.hashed_password):
+    user = await user_dao.get_user_by_email(str(body.email))
+    if not user or not await verify_password_async(body.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Неверные учетные данные")
-    return create_access_token(sub=str(body.email))
+    if password_needs_rehash(user.hashed_password):
+        await user_dao.update(user.id, hashed_password=await hash_password_async(body.password))
+    return ORJSONResponse(create_access_token(sub=str(body.email)))
 
 
-protected_resume_router = APIRouter(
-    prefix="/resume",
-    tags=["resume"],
-    dependencies=[Depends(get_current_user)],
-)
+protected_resume_router = APIRouter(prefix="/resume", tags=["resume"])
 """Защищённые эндпоинты для работы с резюме.
-Доступны только авторизованным пользователям (с JWT-токеном).
+Доступны только авторизованным пользователям (с JWT-токеном):
+каждый обработчик получает `current_user` через `Depends(get_current_user)`.
 Позволяют создавать, просматривать, редактировать и удалять резюме.
 """
 
@@ -76,7 +74,7 @@ async def list_resumes(current_user: Any = Depends(get_current_user)) -> List[Re
     :param current_user: Текущий пользователь (инъекция через Depends).
     :return: Список резюме в формате `ResumeOut`.
     """
-    return await resumedb.get_all_by_user(current_user.id)
+    return await read_dao.get_resumes_by_user(current_user.id)
 
 
 @protected_resume_router.post("/", response_model=ResumeOut, status_code=status.HTTP_201_CREATED)
@@ -88,7 +86,7 @@ async def create_resume(body: ResumeCreate, current_user: Any = Depends(get_curr
     :param current_user: Текущий пользователь.
     :return: Созданное резюме в формате `ResumeOut`.
     """
-    return await resumedb.add_for_user(user_id=current_user.id, **body.dict())
+    return await resume_dao.add_for_user(user_id=current_user.id, **body.model_dump())
 
 
 @protected_resume_router.get("/{res_id}", response_model=ResumeOut)
@@ -101,7 +99,7 @@ async def get_resume(res_id: int, current_user: Any = Depends(get_current_user))
     :raises HTTPException: 404 — если резюме не найдено.
     :return: Резюме в формате `ResumeOut`.
     """
-    item = await resumedb.get_by_id_for_user(res_id, current_user.id)
+    item = await read_dao.get_resume_for_user(res_id, current_user.id)
     if not item:
         raise HTTPException(status_code=404, detail="Resume not found")
     return item
@@ -120,7 +118,7 @@ async def improve_resume(res_id: int, current_user: Any = Depends(get_current_us
     :raises HTTPException: 404 — если резюме не найдено.
     :return: Резюме с модифицированным полем `content` в формате `ResumeOut`.
     """
-    resume_obj = await resumedb.get_by_id_for_user(res_id, current_user.id)
+    resume_obj = await read_dao.get_resume_for_user(res_id, current_user.id)
     if not resume_obj:
         raise HTTPException(status_code=404, detail="Resume not found")
 
@@ -143,10 +141,10 @@ async def update_resume(res_id: int, body: ResumeUpdate, current_user: Any = Dep
         - 404 — если резюме не найдено.
     :return: Обновлённое резюме в формате `ResumeOut`.
     """
-    data = {k: v for k, v in body.dict().items() if v is not None}
+    data = body.model_dump(exclude_unset=True, exclude_none=True)
     if not data:
         raise HTTPException(status_code=400, detail="Nothing to update")
-    item = await resumedb.update_for_user(res_id=res_id, user_id=current_user.id, **data)
+    item = await resume_dao.update_for_user(res_id=res_id, user_id=current_user.id, **data)
     if not item:
         raise HTTPException(status_code=404, detail="Resume not found")
     return item
@@ -162,7 +160,7 @@ async def delete_resume(res_id: int, current_user: Any = Depends(get_current_use
     :raises HTTPException: 404 — если резюме не найдено.
     :return: Удалённое резюме (как подтверждение) в формате `ResumeOut`.
     """
-    item = await resumedb.delete_for_user(res_id=res_id, user_id=current_user.id)
+    item = await resume_dao.delete_for_user(res_id=res_id, user_id=current_user.id)
     if not item:
         raise HTTPException(status_code=404, detail="Resume not found")
     return item
@@ -1,15 +1,25 @@
-from typing import Any, Generic, List, Optional, Type, TypeVar
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import sessionmaker
+import asyncpg
+from sqlalchemy import RowMapping, bindparam, delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from database.models.base import Base
 from database.models.models import Resume, User
-from settings.engine import async_session_maker
+from settings.engine import async_session_maker, conn
 
 TModel = TypeVar("TModel", bound=Base)
 
+# Заранее построенные запросы: выражения собираются один раз при импорте,
+# а значения передаются через bindparam при выполнении.
+_GET_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_DELETE_RESUME_FOR_USER = (
+    delete(Resume)
+    .where(Resume.id == bindparam("res_id"), Resume.user_id == bindparam("user_id"))
+    .returning(Resume.id, Resume.title, Resume.content)
+)
+
 
 class BaseDAO(Generic[TModel]):
     """
@@ -17,14 +27,14 @@ class BaseDAO(Generic[TModel]):
 
     Атрибуты:
         model (Type[TModel]): SQLAlchemy-модель, с которой работает DAO.
-        _session_factory (sessionmaker): Фабрика асинхронных сессий.
+        _session_factory (async_sessionmaker): Фабрика асинхронных сессий.
     """
 
     model: Type[TModel]
-    _session_factory: sessionmaker[AsyncSession] = async_session_maker
+    _session_factory: async_sessionmaker[AsyncSession] = async_session_maker
 
     @classmethod
-    async def get_session(cls) -> AsyncSession:
+    def get_session(cls) -> AsyncSession:
         """
         Получить новую асинхронную сессию.
 
@@ -39,7 +49,7 @@ class BaseDAO(Generic[TModel]):
 
         :return: Список объектов модели.
         """
-        async with await cls.get_session() as session:
+        async with cls._session_factory() as session:
             result = await session.execute(select(cls.model))
             return list(result.scalars().all())
 
@@ -51,7 +61,7 @@ class BaseDAO(Generic[TModel]):
         :param item_id: Идентификатор объекта.
         :return: Экземпляр модели или None, если не найден.
         """
-        async with await cls.get_session() as session:
+        async with cls._session_factory() as session:
             return await session.get(cls.model, item_id)
 
     @classmethod
@@ -62,7 +72,7 @@ class BaseDAO(Generic[TModel]):
         :param values: Поля модели.
         :return: Созданный объект.
         """
-        async with await cls.get_session() as session:
+        async with cls._session_factory() as session:
             async with session.begin():
                 obj = cls.model(**values)
                 session.add(obj)
@@ -77,7 +87,7 @@ class BaseDAO(Generic[TModel]):
         :param values: Поля для обновления.
         :return: Обновлённый объект или None, если не найден.
         """
-        async with await cls.get_session() as session:
+        async with cls._session_factory() as session:
             async with session.begin():
                 obj = await session.get(cls.model, item_id)
                 if not obj:
@@ -95,7 +105,7 @@ class BaseDAO(Generic[TModel]):
         :param item_id: Идентификатор объекта.
         :return: Удалённый объект или None, если не найден.
         """
-        async with await cls.get_session() as session:
+        async with cls._session_factory() as session:
             async with session.begin():
                 obj = await session.get(cls.model, item_id)
                 if not obj:
@@ -118,8 +128,8 @@ class UserDAO(BaseDAO[User]):
         :param email: Электронная почта пользователя.
         :return: Пользователь или None, если не найден.
         """
-        async with await self.get_session() as session:
-            res = await session.execute(select(User).where(User.email == email))
+        async with self._session_factory() as session:
+            res = await session.execute(_GET_USER_BY_EMAIL, {"email": email})
             return res.scalar_one_or_none()
 
     async def create_user(self, *, email: str, hashed_password: str) -> User:
@@ -132,6 +142,27 @@ class UserDAO(BaseDAO[User]):
         """
         return await self.add(email=email, hashed_password=hashed_password)
 
+    async def create_if_absent(self, *, email: str, hashed_password: str) -> Optional[int]:
+        """
+        Создать пользователя одним запросом, если email ещё не занят.
+
+        Выполняет `INSERT ... ON CONFLICT (email) DO NOTHING RETURNING id`.
+
+        :param email: Электронная почта.
+        :param hashed_password: Хэш пароля.
+        :return: ID созданного пользователя или None, если email уже существует.
+        """
+        stmt = (
+            insert(User)
+            .values(email=email, hashed_password=hashed_password)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.id)
+        )
+        async with self._session_factory() as session:
+            async with session.begin():
+                res = await session.execute(stmt)
+                return res.scalar_one_or_none()
+
     async def exists_by_email(self, email: str) -> bool:
         """
         Проверить, существует ли пользователь с указанным email.
@@ -149,31 +180,6 @@ class ResumeDAO(BaseDAO[Resume]):
 
     model = Resume
 
-    async def get_all_by_user(self, user_id: int) -> List[Resume]:
-        """
-        Получить все резюме пользователя.
-
-        :param user_id: ID пользователя.
-        :return: Список резюме.
-        """
-        async with await self.get_session() as session:
-            res = await session.execute(select(Resume).where(Resume.user_id == user_id))
-            return list(res.scalars().all())
-
-    async def get_by_id_for_user(self, res_id: int, user_id: int) -> Optional[Resume]:
-        """
-        Получить резюме по ID для конкретного пользователя.
-
-        :param res_id: ID резюме.
-        :param user_id: ID пользователя.
-        :return: Резюме или None, если не найдено/не принадлежит пользователю.
-        """
-        async with await self.get_session() as session:
-            res = await session.execute(
-                select(Resume).where(Resume.id == res_id, Resume.user_id == user_id)
-            )
-            return res.scalar_one_or_none()
-
     async def add_for_user(self, *, user_id: int, title: str, content: str) -> Resume:
         """
         Добавить новое резюме для пользователя.
@@ -189,39 +195,91 @@ class ResumeDAO(BaseDAO[Resume]):
         """
         Обновить резюме только у его владельца.
 
+        Выполняется одним запросом `UPDATE ... RETURNING`.
+
         :param res_id: ID резюме.
         :param user_id: ID пользователя.
         :param fields: Поля для обновления.
         :return: Обновлённое резюме или None, если не найдено/не принадлежит пользователю.
         """
-        async with await self.get_session() as session:
+        stmt = (
+            update(Resume)
+            .where(Resume.id == res_id, Resume.user_id == user_id)
+            .values(**fields)
+            .returning(Resume)
+        )
+        async with self._session_factory() as session:
             async with session.begin():
-                res = await session.execute(
-                    select(Resume).where(Resume.id == res_id, Resume.user_id == user_id)
-                )
-                obj = res.scalar_one_or_none()
-                if not obj:
-                    return None
-                for k, v in fields.items():
-                    if hasattr(obj, k):
-                        setattr(obj, k, v)
-            return obj
+                res = await session.execute(stmt)
+                return res.scalar_one_or_none()
 
-    async def delete_for_user(self, *, res_id: int, user_id: int) -> Optional[Resume]:
+    async def delete_for_user(self, *, res_id: int, user_id: int) -> Optional[RowMapping]:
         """
         Удалить резюме только у его владельца.
 
+        Выполняется одним запросом `DELETE ... RETURNING`.
+
         :param res_id: ID резюме.
         :param user_id: ID пользователя.
-        :return: Удалённое резюме или None, если не найдено/не принадлежит пользователю.
+        :return: Поля удалённого резюме или None, если не найдено/не принадлежит пользователю.
         """
-        async with await self.get_session() as session:
+        async with self._session_factory() as session:
             async with session.begin():
                 res = await session.execute(
-                    select(Resume).where(Resume.id == res_id, Resume.user_id == user_id)
+                    _DELETE_RESUME_FOR_USER, {"res_id": res_id, "user_id": user_id}
                 )
-                obj = res.scalar_one_or_none()
-                if not obj:
-                    return None
-                await session.delete(obj)
-            return obj
+                return res.mappings().one_or_none()
+
+
+class ReadDAO:
+    """
+    DAO для read-only запросов к резюме напрямую через пул `asyncpg`.
+
+    Используется для чтения в обход ORM; запись остаётся за `ResumeDAO`.
+    """
+
+    @staticmethod
+    def get_pool() -> asyncpg.Pool:
+        """
+        Получить пул соединений `asyncpg`.
+
+        :raises RuntimeError: Если пул ещё не инициализирован.
+        :return: Экземпляр `asyncpg.Pool`.
+        """
+        if conn.asyncpg_pool is None:
+            raise RuntimeError("asyncpg pool is not initialized")
+        return conn.asyncpg_pool
+
+    async def get_resumes_by_user(self, user_id: int) -> List[Dict[str, Any]]:
+        """
+        Получить все резюме пользователя.
+
+        :param user_id: ID пользователя.
+        :return: Список словарей с полями `id`, `title`, `content`.
+        """
+        async with self.get_pool().acquire() as connection:
+            rows = await connection.fetch(
+                "SELECT id, title, content FROM resume WHERE user_id = $1", user_id
+            )
+        return [dict(row) for row in rows]
+
+    async def get_resume_for_user(self, res_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Получить резюме по ID для конкретного пользователя.
+
+        :param res_id: ID резюме.
+        :param user_id: ID пользователя.
+        :return: Словарь с полями резюме или None, если не найдено/не принадлежит пользователю.
+        """
+        async with self.get_pool().acquire() as connection:
+            row = await connection.fetchrow(
+                "SELECT id, title, content FROM resume WHERE id = $1 AND user_id = $2",
+                res_id,
+                user_id,
+            )
+        return dict(row) if row else None
+
+
+user_dao = UserDAO()
+resume_dao = ResumeDAO()
+read_dao = ReadDAO()
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database.models.base import Base
@@ -52,6 +52,10 @@ class Resume(Base):
         user (User): Связанный объект пользователя.
     """
 
+    __table_args__ = (
+        Index("ix_resume_user_id_id", "user_id", "id"),
+    )
+
     id: Mapped[int] = mapped_column(
         Integer,
         primary_key=True,
@@ -1,22 +1,41 @@
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from api.routers import protected_resume_router, router
+from services.auth_service import warmup_password_hasher
 from settings.engine import conn
-from settings.loguru_config import logger
+from settings.loguru_config import logger, setup_logging
 from src.settings.config import app_middleware
 
+setup_logging()
 conn.create_database()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Жизненный цикл приложения: открывает пул `asyncpg` и прогревает
+    хэшер паролей при старте, закрывает пул при остановке.
+    """
+    await conn.init_asyncpg_pool()
+    await warmup_password_hasher()
+    yield
+    await conn.close_asyncpg_pool()
+
+
 app = FastAPI(
     title="ResumeApp API",
     description="API для регистрации пользователей и работы с резюме.",
     version="1.0.0",
     docs_url="/api_docs",
     redoc_url="/api_redoc",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -36,10 +55,14 @@ async def root():
 
 if __name__ == "__main__":
     logger.info("Starting app...")
+    dev = bool(os.getenv("DEV", False))
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=bool(os.getenv("DEV", False)),
+        reload=dev,
+        workers=None if dev else int(os.getenv("WEB_CONCURRENCY", 1)),
+        loop="uvloop",
+        http="httptools",
         log_level="info",
     )
@@ -1,46 +1,116 @@
+import asyncio
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Dict
 
+import bcrypt
+import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, security, status
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jwt import PyJWTError
 
-from api.schemas import Token
-from database.crud import UserDAO
+from database.crud import user_dao
 from settings.config import jwtsettings
 
 oauth2_scheme = security.OAuth2PasswordBearer(tokenUrl="/api/user/login")
-userdb = UserDAO()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = PasswordHasher(time_cost=3, memory_cost=46 * 1024, parallelism=1)
+"""Argon2id с параметрами из рекомендаций OWASP."""
+
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+_PWD_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="pwd-hash")
+"""Пул потоков для хэширования паролей вне event loop."""
+
+TOKEN_CACHE_TTL = 30
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL)
+"""Кэш проверенных токенов: sha256(token) -> (пользователь, exp токена)."""
 
 
 def hash_password(raw: str) -> str:
     """
-    Захэшировать пароль.
+    Захэшировать пароль (Argon2id).
 
     :param raw: Пароль в открытом виде.
     :return: Хэш пароля.
     """
-    return pwd_context.hash(raw)
+    return password_hasher.hash(raw)
 
 
 def verify_password(raw: str, hashed: str) -> bool:
     """
     Проверить соответствие пароля и хэша.
 
+    Поддерживает как Argon2-хэши, так и устаревшие bcrypt-хэши.
+
     :param raw: Пароль в открытом виде.
     :param hashed: Хэш пароля.
     :return: True — если пароль совпадает, False — иначе.
     """
-    return pwd_context.verify(raw, hashed)
+    if hashed.startswith(BCRYPT_PREFIXES):
+        return bcrypt.checkpw(raw.encode(), hashed.encode())
+    try:
+        return password_hasher.verify(hashed, raw)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed: str) -> bool:
+    """
+    Проверить, нужно ли перехэшировать пароль.
+
+    True для bcrypt-хэшей и Argon2-хэшей с устаревшими параметрами.
+
+    :param hashed: Хэш пароля.
+    :return: True — если хэш следует обновить, False — иначе.
+    """
+    if hashed.startswith(BCRYPT_PREFIXES):
+        return True
+    return password_hasher.check_needs_rehash(hashed)
 
 
-def create_access_token(sub: str, expires_minutes: int = jwtsettings.ACCESS_TOKEN_EXPIRE_MIN) -> Token:
+async def hash_password_async(raw: str) -> str:
+    """
+    Захэшировать пароль в пуле потоков, не блокируя event loop.
+
+    :param raw: Пароль в открытом виде.
+    :return: Хэш пароля.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PWD_POOL, hash_password, raw)
+
+
+async def verify_password_async(raw: str, hashed: str) -> bool:
+    """
+    Проверить пароль в пуле потоков, не блокируя event loop.
+
+    :param raw: Пароль в открытом виде.
+    :param hashed: Хэш пароля.
+    :return: True — если пароль совпадает, False — иначе.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PWD_POOL, verify_password, raw, hashed)
+
+
+async def warmup_password_hasher() -> None:
+    """
+    Прогреть хэшер паролей и пул потоков при старте приложения,
+    чтобы первый логин не платил за их инициализацию.
+    """
+    await verify_password_async("warmup", await hash_password_async("warmup"))
+
+
+def create_access_token(sub: str, expires_minutes: int = jwtsettings.ACCESS_TOKEN_EXPIRE_MIN) -> Dict[str, str]:
     """
     Создать JWT-токен доступа.
 
     :param sub: Идентификатор субъекта (обычно email пользователя).
     :param expires_minutes: Время жизни токена в минутах.
-    :return: Объект `Token` с токеном доступа, временем истечения и типом.
+    :return: Словарь в формате схемы `Token`: токен доступа, тип и время истечения.
     """
     now = datetime.now(timezone.utc)
     expire = now + timedelta(minutes=expires_minutes)
@@ -49,14 +119,20 @@ def create_access_token(sub: str, expires_minutes: int = jwtsettings.ACCESS_TOKE
         "iat": int(now.timestamp()),
         "exp": int(expire.timestamp())
     }
-    token = jwt.encode(payload, jwtsettings.JWT_SECRET, algorithm=jwtsettings.JWT_ALG)
-    return Token(access_token=token, expires_at=expire)
+    token = jwt.encode(payload, jwtsettings.signing_key, algorithm=jwtsettings.JWT_ALG)
+    # Формат `expires_at` как у сериализации Pydantic схемы `Token`: UTC с суффиксом `Z`
+    expires_at = expire.isoformat().replace("+00:00", "Z")
+    return {"access_token": token, "token_type": "bearer", "expires_at": expires_at}
 
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     """
     Получить текущего пользователя по JWT-токену.
 
+    Успешно проверенные токены кэшируются в памяти (по sha256 от токена)
+    на `TOKEN_CACHE_TTL` секунд, но не дольше срока действия самого токена.
+    Неудачные проверки не кэшируются.
+
     :param token: JWT-токен (берётся из заголовка Authorization: Bearer).
     :raises HTTPException:
         - 401, если токен отсутствует, неверен или просрочен.
@@ -65,14 +141,28 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     """
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
+
+    key = hashlib.sha256(token.encode()).digest()
+    cached = _token_cache.get(key)
+    if cached is not None:
+        user, exp = cached
+        if exp > time.time():
+            return user
+        _token_cache.pop(key, None)
+
     try:
-        payload = jwt.decode(token, jwtsettings.JWT_SECRET, algorithms=[jwtsettings.JWT_ALG])
+        payload = jwt.decode(token, jwtsettings.verification_key, algorithms=[jwtsettings.JWT_ALG])
         sub = payload.get("sub")
         if not sub:
             raise HTTPException(status_code=401, detail="Invalid token")
-        user = await userdb.get_user_by_email(str(sub))
+        user = await user_dao.get_user_by_email(str(sub))
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
-        return user
-    except JWTError:
+    except PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    # Запись живёт не дольше TTL кэша и не дольше самого токена.
+    exp = min(time.time() + TOKEN_CACHE_TTL, float(payload.get("exp", 0)))
+    if exp > time.time():
+        _token_cache[key] = (user, exp)
+    return user
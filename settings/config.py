@@ -1,6 +1,9 @@
 from pathlib import Path
 
+import jwt
 from dotenv import load_dotenv
+from jwt.algorithms import get_default_algorithms
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Загружаем переменные окружения из .env
@@ -69,10 +72,16 @@ class JWTSettings(BaseSettings):
     Настройки для JWT-аутентификации.
 
     Загружаются из `.env.jwt`.
+
+    По умолчанию используется EdDSA (Ed25519): токены подписываются
+    `JWT_PRIVATE_KEY`, а проверяются только `JWT_PUBLIC_KEY`.
+    Для HS* вместо пары ключей задаётся общий `JWT_SECRET`.
     """
 
-    JWT_SECRET: str
-    JWT_ALG: str
+    JWT_ALG: str = "EdDSA"
+    JWT_SECRET: str | None = None
+    JWT_PRIVATE_KEY: str | None = None
+    JWT_PUBLIC_KEY: str | None = None
     ACCESS_TOKEN_EXPIRE_MIN: int
 
     model_config = SettingsConfigDict(
@@ -82,6 +91,68 @@ class JWTSettings(BaseSettings):
         extra="ignore",
     )
 
+    @model_validator(mode="after")
+    def check_keys(self) -> "JWTSettings":
+        """
+        Проверить при загрузке настроек, что для `JWT_ALG` заданы корректные ключи:
+        токен, подписанный ключом подписи, проходит проверку ключом проверки.
+
+        Ошибка конфигурации прерывает запуск приложения, а не проявляется
+        при первом входе пользователя.
+
+        :return: Проверенные настройки.
+        """
+        algorithms = get_default_algorithms()
+        algorithms.pop("none", None)
+        if self.JWT_ALG not in algorithms:
+            raise ValueError(f"Unsupported JWT_ALG {self.JWT_ALG!r}, expected one of: {', '.join(algorithms)}")
+        algorithm = algorithms[self.JWT_ALG]
+        names = ("JWT_SECRET",) if self.is_symmetric else ("JWT_PRIVATE_KEY", "JWT_PUBLIC_KEY")
+        for name in names:
+            if not getattr(self, name):
+                raise ValueError(f"{name} is required for {self.JWT_ALG}")
+        # Пробный токен: подписываем ключом подписи и проверяем ключом проверки,
+        # чтобы отсеять некорректные, перепутанные и непарные ключи
+        try:
+            token = jwt.encode({"sub": "probe"}, self.signing_key, algorithm=self.JWT_ALG)
+            jwt.decode(token, self.verification_key, algorithms=[self.JWT_ALG])
+        except Exception as e:
+            raise ValueError(f"Invalid {' / '.join(names)} for {self.JWT_ALG}: {e!r}") from e
+        return self
+
+    @property
+    def is_symmetric(self) -> bool:
+        """
+        Используется ли симметричный алгоритм (HS*) с общим секретом.
+
+        :return: True — для HS256/HS384/HS512, False — для асимметричных алгоритмов.
+        """
+        return self.JWT_ALG.upper().startswith("HS")
+
+    @property
+    def signing_key(self) -> str:
+        """
+        Ключ для подписи токенов.
+
+        :return: `JWT_SECRET` для HS*, иначе приватный ключ в формате PEM.
+        """
+        key = self.JWT_SECRET if self.is_symmetric else self.JWT_PRIVATE_KEY
+        if not key:
+            raise ValueError(f"Signing key for {self.JWT_ALG} is not configured")
+        return key
+
+    @property
+    def verification_key(self) -> str:
+        """
+        Ключ для проверки подписи токенов.
+
+        :return: `JWT_SECRET` для HS*, иначе публичный ключ в формате PEM.
+        """
+        key = self.JWT_SECRET if self.is_symmetric else self.JWT_PUBLIC_KEY
+        if not key:
+            raise ValueError(f"Verification key for {self.JWT_ALG} is not configured")
+        return key
+
 
 origins = [
     "http://localhost:3000",
@@ -1,14 +1,19 @@
-import subprocess
+import re
+import socket
+from typing import Optional
 
+import asyncpg
 from sqlalchemy.engine import Engine, create_engine
 from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,
                                     async_sessionmaker, create_async_engine)
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql.expression import text
 
 from settings.config import dbsettings
 from settings.loguru_config import logger
 
+DB_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+"""Допустимое имя БД: `CREATE DATABASE` не поддерживает параметры."""
+
 
 class DBConnection:
     """
@@ -21,16 +26,55 @@ class DBConnection:
         """
         self.settings = dbsettings
         self.engine = self.init_async_engine()
+        self.asyncpg_pool: Optional[asyncpg.Pool] = None
 
     def init_async_engine(self) -> AsyncEngine:
         """
         Создать асинхронный движок SQLAlchemy для работы с PostgreSQL.
 
-        Использует драйвер `asyncpg`.
+        Использует драйвер `asyncpg` с пулом соединений и кэшем
+        подготовленных выражений.
 
         :return: Экземпляр `AsyncEngine`.
         """
-        return create_async_engine(self.settings.asyncpg_url, echo=False)
+        return create_async_engine(
+            self.settings.asyncpg_url,
+            echo=False,
+            pool_size=20,
+            max_overflow=10,
+            pool_timeout=30,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            connect_args={
+                "statement_cache_size": 1024,
+                "prepared_statement_cache_size": 512,
+            },
+        )
+
+    async def init_asyncpg_pool(self) -> asyncpg.Pool:
+        """
+        Создать пул соединений `asyncpg` для read-only запросов в обход ORM.
+
+        Вызывается один раз при старте приложения.
+
+        :return: Экземпляр `asyncpg.Pool`.
+        """
+        if self.asyncpg_pool is None:
+            self.asyncpg_pool = await asyncpg.create_pool(
+                self.settings.psql_url,
+                min_size=5,
+                max_size=20,
+                statement_cache_size=1024,
+            )
+        return self.asyncpg_pool
+
+    async def close_asyncpg_pool(self) -> None:
+        """
+        Закрыть пул соединений `asyncpg`, если он был создан.
+        """
+        if self.asyncpg_pool is not None:
+            await self.asyncpg_pool.close()
+            self.asyncpg_pool = None
 
     def init_engine(self) -> Engine:
         """
@@ -52,17 +96,14 @@ class DBConnection:
 
         :return: Экземпляр `async_sessionmaker`.
         """
-        return sessionmaker(
-            self.engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
-        )
+        return async_sessionmaker(self.engine, expire_on_commit=False)
 
     def create_database(self) -> None:
         """
         Создать базу данных, если она ещё не существует.
 
-        - Проверяет, что PostgreSQL запущен (`pg_isready`).
+        - Проверяет, что PostgreSQL принимает TCP-соединения.
+        - Проверяет имя БД (оно подставляется в `CREATE DATABASE` напрямую).
         - Подключается к системной БД `postgres`.
         - Выполняет SQL-запрос для проверки существования базы.
         - Если базы нет — создаёт её.
@@ -70,21 +111,28 @@ class DBConnection:
         :raises Exception: Логирует ошибку, если создание БД не удалось.
         """
         try:
-            subprocess.run(["pg_isready"], check=True)
-        except subprocess.CalledProcessError:
+            sock = socket.create_connection(
+                (self.settings.DB_HOST, self.settings.DB_PORT), timeout=1.0
+            )
+            sock.close()
+        except OSError:
             logger.error("PostgreSQL is not running")
             return
 
+        db_name = self.settings.DB_NAME
+        if not DB_NAME_RE.fullmatch(db_name):
+            logger.error(f"Invalid database name: {db_name!r}")
+            return
+
         engine = create_engine(
             f"postgresql://{self.settings.DB_USER}:{self.settings.DB_PASSWORD}"
             f"@{self.settings.DB_HOST}:{self.settings.DB_PORT}/postgres",
             isolation_level="AUTOCOMMIT",
         )
-        db_name = self.settings.DB_NAME
         with engine.connect() as connection:
             try:
                 result = connection.execute(
-                    text(f"SELECT 1 FROM pg_database WHERE datname='{db_name}'")
+                    text("SELECT 1 FROM pg_database WHERE datname = :n"), {"n": db_name}
                 )
                 exists = result.scalar() is not None
                 if not exists:
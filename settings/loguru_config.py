@@ -5,18 +5,40 @@
 - Используется библиотека Loguru.
 - Логи разделяются по уровням (DEBUG, INFO, WARNING, ERROR, CRITICAL) в разные файлы.
 - Отдельный файл для access-логов Uvicorn.
+- Опционально (`LOG_JSON=1`) — все логи в формате JSON в `app.json.log`.
 - Автоматическая ротация, хранение и сжатие логов.
 - Перенаправление стандартного `logging` и логов FastAPI/Uvicorn в Loguru.
+
+Импорт модуля ничего не настраивает: sink'и, файлы и фоновые потоки
+создаются один раз вызовом `setup_logging()` при старте приложения.
 """
 
+import atexit
 import logging
+import os
+import queue
+import re
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+import zstandard
 from loguru import logger
 
 # --- Настройки директорий и файлов ---
-LOG_DIR = Path(__file__).resolve().parent.parent / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+# Каталог логов: `LOG_DIR` из окружения или `<корень проекта>/logs`
+LOG_DIR = Path(os.environ.get("LOG_DIR") or Path(__file__).resolve().parent.parent / "logs")
+
+LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+# Числовые значения уровней: по ним маршрутизируются записи, и с ними же
+# Loguru сравнивает `level` sink'а до вызова фильтра
+LEVELS = {name: logger.level(name).no for name in LEVEL_NAMES}
 
 FILES = {
     "DEBUG": LOG_DIR / "debug.log",
@@ -25,86 +47,700 @@ FILES = {
     "ERROR": LOG_DIR / "error.log",
     "CRITICAL": LOG_DIR / "critical.log",
     "ACCESS": LOG_DIR / "access.log",
+    "JSON": LOG_DIR / "app.json.log",
 }
 
 # --- Параметры логов ---
-ROTATION = "10 MB"       # Максимальный размер файла до ротации
-RETENTION = "10 days"    # Время хранения логов
-COMPRESSION = "zip"      # Формат сжатия старых логов
-ENCODING = "utf-8"       # Кодировка лог-файлов
+ROTATION_SIZE = 10 * 1024 * 1024       # Максимальный размер файла до ротации (10 MB)
+RETENTION_SECONDS = 10 * 24 * 60 * 60  # Время хранения логов (10 дней)
+COMPRESSION = "zst"                    # Формат сжатия старых логов (zstd)
+COMPRESSION_LEVEL = 3                  # Уровень сжатия zstd
+ENCODING = "utf-8"                     # Кодировка лог-файлов
+BUFFER_SIZE = 1 << 20                  # Размер буфера каждого файла (1 MiB)
+LOG_JSON = os.environ.get("LOG_JSON", "").lower() in ("1", "true", "yes")  # Дублировать логи в JSON
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")  # Минимальный уровень логов (имя или число)
+LEVEL_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL"}  # Имена уровней `logging`, которых нет в Loguru
+
+# --- Параметры фоновой записи ---
+QUEUE_SIZE = 8192      # Максимум записей в очереди; при переполнении теряются самые старые
+BATCH_SIZE = 256       # Максимум записей, забираемых из очереди за один проход
+FLUSH_INTERVAL = 0.2   # Период сброса буферов на диск (секунды)
+JANITOR_INTERVAL = 3600  # Период обхода LOG_DIR для сжатия и удаления старых логов (секунды)
+SIGTERM_SYNC_TIMEOUT = 1.0  # Сколько обработчик SIGTERM ждёт записи логов на диск (секунды)
+REOPEN_INTERVAL = 5      # Период проверки, не ротировал ли файл другой процесс (секунды)
+ROTATED_MIN_AGE = 600    # Ротированный файл сжимается, если в него не писали столько секунд
+
+# Имена ротированных файлов этого модуля: `<имя>.<время ротации>.log[.zst]`
+# (и `.log.zip` — архивы, оставшиеся от прежних sink'ов Loguru с тем же форматом имени).
+# Janitor не трогает остальные файлы в `LOG_DIR` (каталог может быть общим).
+_ROTATED_RE = re.compile(
+    rf"(?:{'|'.join(re.escape(path.stem) for path in FILES.values())})"
+    rf"\.\d{{4}}-\d{{2}}-\d{{2}}_\d{{2}}-\d{{2}}-\d{{2}}_\d{{6}}\.log"
+    rf"(?P<compressed>\.(?:{COMPRESSION}|zip))?"
+)
+
+
+def _iov_max() -> int:
+    """
+    Максимум буферов в одном вызове `os.writev` (`IOV_MAX`).
+
+    :return: Значение `SC_IOV_MAX` или 1024, если система его не сообщает.
+    """
+    try:
+        value = os.sysconf("SC_IOV_MAX")
+    except (AttributeError, ValueError, OSError):
+        return 1024
+    return value if value > 0 else 1024
+
+
+_IOV_MAX = _iov_max()
+
+# fdatasync (только данные, без метаданных) там, где он есть
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# Очередь записей (writer, байты) для фонового потока
+_QUEUE: "queue.Queue[tuple[LogWriter, bytes]]" = queue.Queue(maxsize=QUEUE_SIZE)
+_WRITE_LOCK = threading.Lock()
+
+# Запрос обработчика SIGTERM к потоку записи и ответ о его выполнении
+_SYNC_REQUEST = threading.Event()
+_SYNC_DONE = threading.Event()
+
+# Сжатие ротированных файлов выполняет janitor-поток, вне потока записи
+_COMPRESSOR = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL, threads=-1)
+
+
+def _is_moved(path: Path, fd: int) -> bool:
+    """
+    Проверить, что `path` больше не указывает на файл, открытый как `fd`.
+
+    Так бывает, когда файл ротировал другой процесс с тем же `LOG_DIR`
+    (воркер uvicorn) или файл удалили.
+
+    :param path: Путь к лог-файлу.
+    :param fd: Открытый дескриптор этого файла.
+    :return: True, если файл переименован или удалён.
+    """
+    try:
+        return os.stat(path).st_ino != os.fstat(fd).st_ino
+    except FileNotFoundError:
+        return True
+
+
+def _compress(path: Path) -> None:
+    """
+    Сжать ротированный лог-файл в `<имя>.zst` и удалить исходный файл.
+
+    Архив создаётся в эксклюзивном режиме, поэтому если тот же файл уже
+    сжимает другой процесс (воркер uvicorn), повторного сжатия не будет.
+
+    :param path: Путь к ротированному файлу.
+    """
+    target = Path(f"{path}.{COMPRESSION}")
+    with open(path, "rb") as src, open(target, "xb") as dst:
+        try:
+            _COMPRESSOR.copy_stream(src, dst)
+        except Exception:
+            target.unlink(missing_ok=True)
+            raise
+    path.unlink()
+
+
+def _cleanup_log_dir() -> None:
+    """
+    Один проход по `LOG_DIR`: сжать ротированные файлы и удалить архивы
+    старше `RETENTION_SECONDS`.
+
+    Обрабатываются только файлы, ротированные этим модулем (`_ROTATED_RE`).
+    Файлы, изменённые за последние `ROTATED_MIN_AGE` секунд, не сжимаются:
+    в них ещё могут дописывать воркеры, которые не заметили ротацию.
+    """
+    now = time.time()
+    deadline = now - RETENTION_SECONDS
+    quiet_since = now - ROTATED_MIN_AGE
+    with os.scandir(LOG_DIR) as entries:
+        for entry in entries:
+            match = _ROTATED_RE.fullmatch(entry.name)
+            if match is None:
+                continue
+            try:
+                if match["compressed"]:
+                    if entry.stat().st_mtime < deadline:
+                        os.unlink(entry.path)
+                elif entry.stat().st_mtime < quiet_since:
+                    _compress(Path(entry.path))
+            except FileExistsError:
+                continue
+            except Exception as e:
+                logger.error(f"Error while cleaning up log file {entry.path}: {e!r}")
+
+
+def _janitor_loop() -> None:
+    """
+    Фоновый поток обслуживания логов: раз в `JANITOR_INTERVAL` выполняет
+    `_cleanup_log_dir()` (первый проход — сразу при старте).
+
+    Ошибка прохода записывается в лог и не останавливает поток.
+    """
+    while True:
+        try:
+            _cleanup_log_dir()
+        except Exception as e:
+            logger.error(f"Error while cleaning up log directory {LOG_DIR}: {e!r}")
+        time.sleep(JANITOR_INTERVAL)
+
+
+class RotatingWriter:
+    """
+    Буферизованный writer лог-файла с ротацией по размеру.
 
+    Считает записанные байты сам, без обращения к файлу; при превышении
+    `ROTATION_SIZE` переименовывает файл и открывает новый. Сжатие
+    и удаление старых файлов выполняет janitor-поток.
 
-def exact_level(level_name: str):
+    Если файл уже ротировал другой процесс, writer только открывает
+    `path` заново (см. `reopen_if_moved`).
     """
-    Фильтр для логов: пропускает ТОЛЬКО записи с указанным уровнем.
 
-    :param level_name: Уровень логирования (например, "INFO").
-    :return: Функция-фильтр для Loguru.
+    def __init__(self, path: Path):
+        """
+        :param path: Путь к лог-файлу.
+        """
+        self.path = path
+        self._file = open(path, "ab", buffering=BUFFER_SIZE)
+        self._size = self._file.tell()
+
+    def writelines(self, lines: list[bytes]) -> None:
+        """
+        Записать несколько записей одним вызовом и при необходимости ротировать файл.
+
+        :param lines: Отформатированные записи.
+        """
+        self._file.writelines(lines)
+        self._size += sum(map(len, lines))
+        if self._size >= ROTATION_SIZE:
+            self.rotate()
+
+    def flush(self) -> None:
+        """
+        Сбросить буфер в ядро (page cache), без ожидания записи на диск.
+        """
+        self._file.flush()
+
+    def sync(self) -> None:
+        """
+        Сбросить буфер и дождаться записи данных на диск (`fdatasync`).
+        """
+        self._file.flush()
+        _fdatasync(self._file.fileno())
+
+    def rotate(self) -> None:
+        """
+        Синхронизировать текущий файл с диском, переименовать его и открыть новый.
+
+        Файл открывается заново и при ошибке переименования, чтобы writer
+        не остался с закрытым файлом; ротация повторится при следующей записи.
+        """
+        self.sync()
+        rotated = self.path.with_name(
+            f"{self.path.stem}.{datetime.now():%Y-%m-%d_%H-%M-%S_%f}{self.path.suffix}"
+        )
+        try:
+            if not _is_moved(self.path, self._file.fileno()):
+                os.rename(self.path, rotated)
+        finally:
+            self._reopen()
+
+    def reopen_if_moved(self) -> None:
+        """
+        Открыть `path` заново, если файл ротировал другой процесс.
+        """
+        if _is_moved(self.path, self._file.fileno()):
+            self._reopen()
+
+    def _reopen(self) -> None:
+        """
+        Закрыть текущий файл (со сбросом буфера) и открыть `path`.
+        """
+        self._file.close()
+        self._file = open(self.path, "ab", buffering=BUFFER_SIZE)
+        self._size = self._file.tell()
+
+
+class AppendFdWriter:
+    """
+    Небуферизованный writer лог-файла поверх дескриптора с O_APPEND.
+
+    Пачка записей уходит в файл одним системным вызовом (`os.writev`),
+    без промежуточного буфера Python. Ротация — по размеру, с подменой
+    дескриптора через `dup2`, чтобы номер `fd` оставался прежним.
+    """
+
+    FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+
+    def __init__(self, path: Path):
+        """
+        :param path: Путь к лог-файлу.
+        """
+        self.path = path
+        self.fd = os.open(path, self.FLAGS, 0o644)
+        self._size = os.fstat(self.fd).st_size
+
+    def writelines(self, lines: list[bytes]) -> None:
+        """
+        Записать пачку записей (по одному системному вызову на каждые
+        `_IOV_MAX` записей) и при необходимости ротировать файл.
+
+        :param lines: Отформатированные записи.
+        """
+        for start in range(0, len(lines), _IOV_MAX):
+            self._write(lines[start:start + _IOV_MAX])
+        if self._size >= ROTATION_SIZE:
+            self.rotate()
+
+    def _write(self, chunk: list[bytes]) -> None:
+        """
+        Записать не больше `_IOV_MAX` записей; при неполной записи дописать остаток.
+
+        :param chunk: Отформатированные записи.
+        """
+        size = sum(map(len, chunk))
+        written = os.writev(self.fd, chunk) if hasattr(os, "writev") else 0
+        if written < size:
+            rest = memoryview(b"".join(chunk))[written:]
+            while rest:
+                rest = rest[os.write(self.fd, rest):]
+        self._size += size
+
+    def flush(self) -> None:
+        """
+        Буфера нет — данные уже переданы ядру.
+        """
+
+    def sync(self) -> None:
+        """
+        Дождаться записи данных на диск (`fdatasync`).
+        """
+        _fdatasync(self.fd)
+
+    def rotate(self) -> None:
+        """
+        Синхронизировать текущий файл с диском, переименовать его
+        и открыть новый на месте `fd`.
+        """
+        self.sync()
+        rotated = self.path.with_name(
+            f"{self.path.stem}.{datetime.now():%Y-%m-%d_%H-%M-%S_%f}{self.path.suffix}"
+        )
+        if not _is_moved(self.path, self.fd):
+            os.rename(self.path, rotated)
+        self._reopen()
+
+    def reopen_if_moved(self) -> None:
+        """
+        Открыть `path` заново на месте `fd`, если файл ротировал другой процесс.
+        """
+        if _is_moved(self.path, self.fd):
+            self._reopen()
+
+    def _reopen(self) -> None:
+        """
+        Открыть `path` и подменить им текущий `fd`.
+        """
+        new_fd = os.open(self.path, self.FLAGS, 0o644)
+        os.dup2(new_fd, self.fd)
+        os.close(new_fd)
+        self._size = os.fstat(self.fd).st_size
+
+
+LogWriter = RotatingWriter | AppendFdWriter
+
+ACCESS_LOGGER_NAME = "uvicorn.access"
+ACCESS_EXTRA_KEY = "access"  # Ключ в `extra`, которым помечаются access-записи
+
+# Writer'ы файлов: ключ из FILES -> writer (заполняется в setup_logging)
+_WRITERS: dict[str, LogWriter] = {}
+
+# Writer'ы файлов уровней по числовому значению уровня (заполняется в setup_logging)
+_WRITERS_BY_NO: dict[int, LogWriter] = {}
+
+
+def _report_error(writer: LogWriter, error: Exception) -> None:
+    """
+    Сообщить об ошибке записи лог-файла в `stderr` (как `catch=True` у sink'ов Loguru).
+
+    Поток записи при этом продолжает работу, остальные файлы не затрагиваются.
+
+    :param writer: Writer файла, в котором произошла ошибка.
+    :param error: Исключение.
     """
+    try:
+        sys.stderr.write(f"Logging error in {writer.path}: {error!r}\n")
+    except Exception:
+        pass
+
 
-    def _filter(record):
-        return record["level"].name == level_name
+def _write_batch(batch: list[tuple[LogWriter, bytes]]) -> None:
+    """
+    Записать пачку записей: по одному `writelines()` на каждый файл.
 
-    return _filter
+    :param batch: Список пар (writer, байты записи).
+    """
+    grouped: dict[LogWriter, list[bytes]] = {}
+    for writer, data in batch:
+        grouped.setdefault(writer, []).append(data)
+    with _WRITE_LOCK:
+        for writer, lines in grouped.items():
+            try:
+                writer.writelines(lines)
+            except Exception as e:
+                _report_error(writer, e)
 
 
-def only_uvicorn_access(record):
+def _flush_all() -> None:
+    """
+    Сбросить буферы всех открытых лог-файлов.
+    """
+    with _WRITE_LOCK:
+        for writer in _WRITERS.values():
+            try:
+                writer.flush()
+            except Exception as e:
+                _report_error(writer, e)
+
+
+def _reopen_moved() -> None:
+    """
+    Открыть заново лог-файлы, которые ротировал другой процесс.
+    """
+    with _WRITE_LOCK:
+        for writer in _WRITERS.values():
+            try:
+                writer.reopen_if_moved()
+            except Exception as e:
+                _report_error(writer, e)
+
+
+def _drain(batch: list[tuple[LogWriter, bytes]], limit: int) -> None:
+    """
+    Забрать из очереди без ожидания до `limit` записей.
+
+    :param batch: Список, в который добавляются записи.
+    :param limit: Максимальный размер пачки.
+    """
+    while len(batch) < limit:
+        try:
+            batch.append(_QUEUE.get_nowait())
+        except queue.Empty:
+            return
+
+
+def _writer_loop() -> None:
+    """
+    Фоновый поток записи: забирает записи пачками, пишет их в файлы
+    и сбрасывает буферы не реже, чем раз в `FLUSH_INTERVAL`.
+
+    Раз в `REOPEN_INTERVAL` открывает заново файлы, ротированные другим
+    процессом, чтобы не писать в уже переименованный файл. По запросу
+    обработчика SIGTERM дописывает очередь и синхронизирует файлы с диском.
+
+    Ошибка записи в один файл сообщается в `stderr` и не останавливает поток.
+    """
+    last_flush = last_reopen = time.monotonic()
+    while True:
+        try:
+            batch = [_QUEUE.get(timeout=FLUSH_INTERVAL)]
+        except queue.Empty:
+            batch = []
+        if batch:
+            _drain(batch, BATCH_SIZE)
+            _write_batch(batch)
+        now = time.monotonic()
+        if not batch or now - last_flush >= FLUSH_INTERVAL:
+            _flush_all()
+            last_flush = now
+        if now - last_reopen >= REOPEN_INTERVAL:
+            _reopen_moved()
+            last_reopen = now
+        if _SYNC_REQUEST.is_set():
+            _SYNC_REQUEST.clear()
+            _shutdown()
+            _SYNC_DONE.set()
+
+
+def _shutdown() -> None:
+    """
+    Дописать оставшиеся в очереди записи, сбросить буферы
+    и синхронизировать файлы с диском (при выходе или по запросу
+    обработчика SIGTERM — в потоке записи).
+    """
+    batch: list[tuple[LogWriter, bytes]] = []
+    _drain(batch, QUEUE_SIZE)
+    if batch:
+        _write_batch(batch)
+    with _WRITE_LOCK:
+        for writer in _WRITERS.values():
+            try:
+                writer.sync()
+            except Exception as e:
+                _report_error(writer, e)
+
+
+def _on_sigterm(signum, frame) -> None:
+    """
+    Обработчик SIGTERM: сохранить логи на диск и передать сигнал
+    предыдущему обработчику (по умолчанию — завершить процесс).
+
+    Сигнал мог прервать главный поток внутри `_enqueue`, пока тот держит
+    блокировку очереди, поэтому обработчик не трогает ни очередь, ни файлы:
+    запись выполняет поток записи, а обработчик ждёт его не дольше
+    `SIGTERM_SYNC_TIMEOUT`.
+    """
+    _SYNC_DONE.clear()
+    _SYNC_REQUEST.set()
+    _SYNC_DONE.wait(SIGTERM_SYNC_TIMEOUT)
+    if callable(_PREV_SIGTERM):
+        _PREV_SIGTERM(signum, frame)
+    elif _PREV_SIGTERM != signal.SIG_IGN:
+        signal.signal(signum, signal.SIG_DFL)
+        signal.raise_signal(signum)
+
+
+def _enqueue(writer: LogWriter, data: bytes) -> None:
+    """
+    Поставить запись в очередь фонового потока.
+
+    Если очередь переполнена, самая старая запись отбрасывается.
+
+    :param writer: Writer целевого файла.
+    :param data: Отформатированная запись.
+    """
+    item = (writer, data)
+    try:
+        _QUEUE.put_nowait(item)
+    except queue.Full:
+        try:
+            _QUEUE.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            _QUEUE.put_nowait(item)
+        except queue.Full:
+            pass
+
+
+def level_file_sink(message) -> None:
+    """
+    Единый sink для логов по уровням: отправляет запись в файл её уровня.
+
+    Записи с уровнями вне `LEVEL_NAMES` (например, SUCCESS) отбрасываются.
+
+    :param message: Отформатированное сообщение Loguru.
+    """
+    writer = _WRITERS_BY_NO.get(message.record["level"].no)
+    if writer is not None:
+        _enqueue(writer, message.encode(ENCODING))
+
+
+def json_file_sink(message) -> None:
+    """
+    Sink для JSON-логов (включается через `LOG_JSON`).
+
+    Запись сериализуется `orjson` в одну строку с полями:
+    `t` — время (Unix timestamp), `l` — числовой уровень,
+    `m` — сообщение, `n` — имя модуля.
+
+    :param message: Сообщение Loguru.
+    """
+    record = message.record
+    _enqueue(
+        _WRITERS["JSON"],
+        orjson.dumps(
+            {
+                "t": record["time"].timestamp(),
+                "l": record["level"].no,
+                "m": record["message"],
+                "n": record["name"],
+            },
+            option=orjson.OPT_APPEND_NEWLINE,
+        ),
+    )
+
+
+def access_file_sink(message) -> None:
+    """
+    Sink для access-логов Uvicorn.
+
+    Запись уходит в очередь фонового потока, поэтому event loop
+    не блокируется на системном вызове записи.
+
+    :param message: Сообщение Loguru.
+    """
+    record = message.record
+    line = f"{record['time'].isoformat(' ', 'milliseconds')} | {record['message']}\n"
+    _enqueue(_WRITERS["ACCESS"], line.encode(ENCODING))
+
+
+def only_uvicorn_access(record, _key=ACCESS_EXTRA_KEY):
     """
     Фильтр: только access-логи uvicorn (HTTP-запросы).
 
+    Имя записи Loguru — это модуль, вызвавший `logging`, а не имя
+    стандартного логгера, поэтому `InterceptHandler` помечает записи
+    логгера `uvicorn.access` ключом `ACCESS_EXTRA_KEY` в `extra`.
+    Ключ передаётся аргументом по умолчанию, чтобы не искать
+    глобальное имя на каждой записи.
+
     :param record: Запись лога.
     :return: True, если лог принадлежит `uvicorn.access`.
     """
-    return record["name"].startswith("uvicorn.access")
+    return _key in record["extra"]
 
 
-# --- Настройка Loguru ---
-logger.remove()  # удаляем стандартный sink (stdout)
+# Логгер для записей `uvicorn.access`, помеченных для access-sink'а
+_ACCESS_LOGGER = logger.bind(**{ACCESS_EXTRA_KEY: True})
 
-# Логи по уровням
-for lvl in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
-    logger.add(
-        FILES[lvl],
-        level="DEBUG",  # захватываем все уровни, фильтруем вручную
-        filter=exact_level(lvl),
-        rotation=ROTATION,
-        retention=RETENTION,
-        compression=COMPRESSION,
-        encoding=ENCODING,
-        enqueue=True,  # безопасная запись из разных потоков
-    )
+# Готовые `opt(depth=6)` для записей без исключения (подавляющее большинство)
+_OPT_NOEXC = logger.opt(depth=6)
+_ACCESS_OPT_NOEXC = _ACCESS_LOGGER.opt(depth=6)
+
+# Обработчик SIGTERM, который был установлен до setup_logging()
+_PREV_SIGTERM = None
 
-# Отдельный лог-файл для access-логов Uvicorn
-logger.add(
-    FILES["ACCESS"],
-    level="DEBUG",
-    filter=only_uvicorn_access,
-    rotation=ROTATION,
-    retention=RETENTION,
-    compression=COMPRESSION,
-    encoding=ENCODING,
-    enqueue=True,
-)
+
+@lru_cache(maxsize=64)
+def _loguru_level(levelno: int, levelname: str) -> int | str:
+    """
+    Сопоставить уровень стандартного `logging` уровню Loguru.
+
+    Результат кэшируется, поэтому поиск уровня (и исключение для
+    неизвестных уровней) выполняется один раз на каждую пару.
+
+    :param levelno: Числовой уровень записи `logging`.
+    :param levelname: Имя уровня записи `logging`.
+    :return: Имя уровня Loguru или число, если такого уровня в Loguru нет.
+    """
+    try:
+        return logger.level(levelname).name
+    except ValueError:
+        return levelno
 
 
 class InterceptHandler(logging.Handler):
     """
     Хэндлер для перехвата логов из стандартного модуля `logging`
     и перенаправления их в Loguru.
+
+    Loguru потокобезопасен сам по себе, поэтому хэндлер не создаёт
+    собственную блокировку и не захватывает её на каждую запись,
+    а фильтры хэндлера не поддерживаются.
     """
 
+    def createLock(self):
+        self.lock = None
+
+    def handle(self, record):
+        self.emit(record)
+        return True
+
     def emit(self, record):
-        try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
-        logger.opt(depth=6, exception=record.exc_info).log(level, record.getMessage())
+        level = _loguru_level(record.levelno, record.levelname)
+        # Без аргументов форматирование `%` не нужно — берём сообщение как есть
+        msg = record.msg
+        message = msg if not record.args and isinstance(msg, str) else record.getMessage()
+        is_access = record.name == ACCESS_LOGGER_NAME
+        if record.exc_info:
+            target = _ACCESS_LOGGER if is_access else logger
+            target.opt(depth=6, exception=record.exc_info).log(level, message)
+        else:
+            (_ACCESS_OPT_NOEXC if is_access else _OPT_NOEXC).log(level, message)
+
+
+def _resolve_min_level(value: str) -> int:
+    """
+    Вычислить нижнюю границу уровней для sink'ов из `LOG_LEVEL`.
+
+    Принимает имя уровня Loguru, псевдонимы `logging` (`WARN`, `FATAL`)
+    или число. Уровни ниже DEBUG поднимаются до DEBUG. Если ни один sink
+    не принимает DEBUG, Loguru завершает `logger.debug()` сразу, не создавая запись.
+
+    :param value: Значение `LOG_LEVEL`.
+    :raises ValueError: Если уровень неизвестен.
+    :return: Числовой уровень.
+    """
+    name = value.strip().upper()
+    if name.isdigit():
+        return max(int(name), LEVELS["DEBUG"])
+    try:
+        no = logger.level(LEVEL_ALIASES.get(name, name)).no
+    except ValueError:
+        raise ValueError(
+            f"Unknown LOG_LEVEL {value!r}, expected a number or one of: {', '.join(LEVEL_NAMES)}"
+        ) from None
+    return max(no, LEVELS["DEBUG"])
+
+
+LOGGING_READY = False
+
+
+def setup_logging() -> None:
+    """
+    Настроить логирование приложения. Повторные вызовы ничего не делают.
+
+    - Открывает лог-файлы и запускает фоновые потоки записи и janitor.
+    - Заменяет стандартный sink Loguru на sink'и по уровням, access и JSON.
+    - Регистрирует сохранение логов на диск при выходе и по SIGTERM.
+    - Перенаправляет стандартный `logging` и логи FastAPI/Uvicorn в Loguru.
+
+    :raises ValueError: Если `LOG_LEVEL` задан неизвестным уровнем.
+    """
+    global LOGGING_READY, _PREV_SIGTERM
+    if LOGGING_READY:
+        return
+
+    min_level = _resolve_min_level(LOG_LEVEL)
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Access-лог пишется через O_APPEND-дескриптор, остальные — через буферизованные файлы
+    _WRITERS.update({lvl: RotatingWriter(FILES[lvl]) for lvl in LEVEL_NAMES})
+    _WRITERS["ACCESS"] = AppendFdWriter(FILES["ACCESS"])
+    if LOG_JSON:
+        _WRITERS["JSON"] = RotatingWriter(FILES["JSON"])
+    _WRITERS_BY_NO.update({LEVELS[lvl]: _WRITERS[lvl] for lvl in LEVEL_NAMES})
+
+    # --- Настройка Loguru ---
+    logger.remove()  # удаляем стандартный sink (stdout)
+
+    threading.Thread(target=_writer_loop, name="log-writer", daemon=True).start()
+    threading.Thread(target=_janitor_loop, name="log-janitor", daemon=True).start()
+    atexit.register(_shutdown)
+
+    # Запись на диск по fdatasync — только при остановке и ротации, а не на каждую запись
+    if threading.current_thread() is threading.main_thread():
+        _PREV_SIGTERM = signal.getsignal(signal.SIGTERM)
+        signal.signal(signal.SIGTERM, _on_sigterm)
+
+    # Логи по уровням: один sink, запись маршрутизируется по уровню
+    logger.add(level_file_sink, level=min_level)
+
+    # Отдельный лог-файл для access-логов Uvicorn (пишутся с уровнем INFO,
+    # поэтому DEBUG-записи отсекаются до вызова фильтра)
+    logger.add(access_file_sink, level=LEVELS["INFO"], filter=only_uvicorn_access, format="{message}")
+
+    # JSON-логи: сериализация выполняется в sink'е, встроенный `serialize` не используется
+    if LOG_JSON:
+        logger.add(json_file_sink, level=min_level, format="{message}")
+
+    # Один хэндлер на все логгеры
+    intercept_handler = InterceptHandler()
 
+    # Перенастройка стандартного logging
+    logging.basicConfig(handlers=[intercept_handler], level=0, force=True)
 
-# Перенастройка стандартного logging
-logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
+    # Перенаправляем логи FastAPI и Uvicorn в Loguru
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access", "fastapi"):
+        std_logger = logging.getLogger(name)
+        std_logger.handlers = [intercept_handler]
+        std_logger.propagate = False
 
-# Перенаправляем логи FastAPI и Uvicorn в Loguru
-for name in ("uvicorn", "uvicorn.error", "uvicorn.access", "fastapi"):
-    logging.getLogger(name).handlers = [InterceptHandler()]
-    logging.getLogger(name).propagate = False
+    LOGGING_READY = True